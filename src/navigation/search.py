@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import ClassVar, Optional
+from typing import ClassVar, Dict, Optional, Tuple
 
 import numpy as np
 
@@ -10,29 +10,42 @@ from drive import get_drive_command
 
 STOP_THRESH = 0.2
 DRIVE_FWD_THRESH = 0.95
+# A cached spiral is only resumed if the rover is within this distance of its center,
+# otherwise a new spiral is generated around the rover
+RESUME_CENTER_THRESH = 1.0
 
 
 @dataclass
 class SearchTrajectory:
-    # Coordinates of the trajectory
-    coordinates: np.ndarray
+    # Declared by hand since dataclass(slots=True) needs Python 3.10. Slotted fields
+    # cannot have class level defaults, so cur_pt is passed explicitly
+    __slots__ = ("axes", "fid_id", "cur_pt")
+    # Coordinates of the trajectory as a read only (3, N) float32 array, each row holding one
+    # axis (x, y, z) contiguously, so axes[:, i] is the i-th point
+    axes: np.ndarray
     # Associated fiducial for this trajectory
     fid_id: int
     # Currently tracked coordinate index along trajectory
-    cur_pt: int = 0
+    cur_pt: int
     # Helper for building spiral
     dirs: ClassVar[np.ndarray] = np.array([[0, -1], [-1, 0], [0, 1], [1, 0]])
 
     def get_cur_pt(self) -> np.ndarray:
-        return self.coordinates[self.cur_pt]
+        # Column view into the read only trajectory
+        return self.axes[:, self.cur_pt]
 
-    def increment_point(self) -> bool:
+    def step(self, arrived: bool) -> Tuple[bool, Optional[np.ndarray]]:
         """
-        Increments the tracked point in the trajectory, returns true if
-        the trajectory is finished
+        Advances the tracked point in the trajectory if we arrived at the current one
+        :param arrived: whether the rover reached the current point
+        :return:        whether the trajectory is finished, and the point to drive to next
+                        (None if finished)
         """
-        self.cur_pt += 1
-        return self.cur_pt >= len(self.coordinates)
+        if arrived:
+            self.cur_pt += 1
+            if self.cur_pt >= self.axes.shape[1]:
+                return True, None
+        return False, self.get_cur_pt()
 
     @classmethod
     def spiral_traj(cls, center: np.ndarray, num_turns: int, distance: int, fid_id: int) -> SearchTrajectory:
@@ -41,25 +54,26 @@ class SearchTrajectory:
         :param center:      position to center spiral on (np.ndarray)
         :param num_turns:   number of times to spiral around
         :param distance:    initial distance and increment (int)
-        :return:            list of positions for the rover to traverse List(np.ndarray)
+        :return:            trajectory holding the positions for the rover to traverse
         """
-        # First we will attempt to create the "delta" vectors that get added add each point
-        # in the spiral to get to the next.
-        deltas = np.tile(cls.dirs, (num_turns, 1))
-        # We will build the coeficients for the delta vecs now that we have the correct
-        # layout of unit vectors Given the distance parameter 'd', the coef layout we
-        # need is [d,d,2d,2d,3d,3d...]
-        dist_coefs = distance * np.repeat(np.arange(1, num_turns * 2 + 1), 2).reshape(-1, 1)
-        deltas *= dist_coefs
-        # At this point we use cumsum to create a new array of vectors where each vector
-        # is the sum of all the previous deltas up to that index in the old array. We
-        # also make sure to add the center coordinate in here too so the spiral is in
-        # the correct location
-        coordinates = np.cumsum(np.vstack((center, deltas)), axis=0)
-        return SearchTrajectory(
-            np.hstack((coordinates, np.zeros(coordinates.shape[0]).reshape(-1, 1))),
-            fid_id,
-        )
+        # Each segment k of the spiral moves along dirs[k % 4] by a length that grows
+        # every two segments. Given the distance parameter 'd', the lengths are
+        # [d,d,2d,2d,3d,3d...], so both can be computed directly from the segment index
+        num_segments = num_turns * 4
+        k = np.arange(num_segments)
+        lengths = distance * (k // 2 + 1)
+        dirs = cls.dirs[k % 4]
+        # Fill a single preallocated float32 buffer whose rows are the x, y and z axes:
+        # index 0 holds the center and the following indices hold the segment deltas.
+        # Accumulating the x and y rows in place then turns the deltas into positions.
+        # The z row stays zero
+        coordinates = np.zeros((3, num_segments + 1), dtype=np.float32)
+        coordinates[:2, 0] = center
+        np.multiply(dirs.T, lengths, out=coordinates[:2, 1:])
+        np.cumsum(coordinates[:2], axis=1, out=coordinates[:2])
+        # Trajectories are cached and resumed, so make sure nothing driving to a point can modify them
+        coordinates.flags.writeable = False
+        return SearchTrajectory(coordinates, fid_id, 0)
 
 
 class SearchState(BaseState):
@@ -72,36 +86,46 @@ class SearchState(BaseState):
             add_outcomes=["waypoint_traverse", "single_fiducial", "search"],
         )
         self.traj: Optional[SearchTrajectory] = None
+        # Trajectories already generated for each fiducial, so returning to a fiducial
+        # near where its spiral was generated resumes it instead of regenerating it
+        self.traj_cache: Dict[int, SearchTrajectory] = {}
 
     def evaluate(self, ud):
         # Check if a path has been generated and its associated with the same
-        # waypoint as the previous one. Generate one if not
+        # waypoint as the previous one. Reuse or generate one if not
         waypoint = self.context.course.current_waypoint()
         if self.traj is None or self.traj.fid_id != waypoint.fiducial_id:
-            self.traj = SearchTrajectory.spiral_traj(
-                self.context.rover.get_pose().position[0:2],
-                5,
-                2,
-                waypoint.fiducial_id,
-            )
+            rover_pos = self.context.rover.get_pose().position[0:2]
+            self.traj = self.traj_cache.get(waypoint.fiducial_id)
+            # Small differences from pose noise are tolerated, but a spiral centered
+            # somewhere else entirely is not reused
+            if self.traj is None or np.hypot(*(self.traj.axes[:2, 0] - rover_pos)) > RESUME_CENTER_THRESH:
+                self.traj = SearchTrajectory.spiral_traj(
+                    rover_pos,
+                    5,
+                    2,
+                    waypoint.fiducial_id,
+                )
+                self.traj_cache[waypoint.fiducial_id] = self.traj
 
         # continue executing this path from wherever it left off
-        target_pos = self.traj.get_cur_pt()
         cmd_vel, arrived = get_drive_command(
-            target_pos,
+            self.traj.get_cur_pt(),
             self.context.rover.get_pose(),
             STOP_THRESH,
             DRIVE_FWD_THRESH,
         )
-        if arrived:
-            # if we finish the spiral without seeing the fiducial, move on with course
-            if self.traj.increment_point():
-                return "waypoint_traverse"
+        # if we finish the spiral without seeing the fiducial, move on with course
+        finished, _ = self.traj.step(arrived)
+        if finished:
+            # forget the finished spiral so searching for this fiducial again starts a new one
+            del self.traj_cache[self.traj.fid_id]
+            self.traj = None
+            return "waypoint_traverse"
 
         self.context.rover.send_drive_command(cmd_vel)
         # if we see the fiduicial, go to the fiducial state
-        current_waypoint = self.context.course.current_waypoint()
-        if current_waypoint.fiducial_id != Environment.NO_FIDUCIAL and self.context.env.current_fid_pos() is not None:
+        if waypoint.fiducial_id != Environment.NO_FIDUCIAL and self.context.env.current_fid_pos() is not None:
             return "single_fiducial"
 
         return "search"
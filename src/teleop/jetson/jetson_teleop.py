@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 # Node for teleop-related callback functions
 
-from math import copysign
 import typing
 from enum import IntEnum
 import rospy as ros
@@ -11,24 +10,28 @@ from mrover.msg import Chassis
 
 
 def quadratic(val):
-    return copysign(val**2, val)
+    return val * abs(val)
 
 
-def deadzone(magnitude, threshold):
-    temp_mag = abs(magnitude)
-    if temp_mag <= threshold:
-        temp_mag = 0
-    else:
-        temp_mag = (temp_mag - threshold) / (1 - threshold)
+# Applies a deadzone followed by quadratic scaling to a joystick axis value
+def deadzone_quadratic(val, threshold):
+    magnitude = max(abs(val) - threshold, 0.0) / (1 - threshold)
+    return ((val > 0) - (val < 0)) * magnitude * magnitude
 
-    return copysign(temp_mag, magnitude)
 
-
-# Modifies joints dict when passed
-# Function to assign values to a joint in a joint dict
-def create_joint_msg(joints, joint, value):
-    joints[joint] = JointState()
-    joints[joint].velocity.append(value)
+# Shapes raw joystick input into velocities for every arm joint.
+# axis_joints holds an (axis index, multiplier) pair per joystick driven joint, whose axis is deadzoned
+# and quadratically scaled. button_joints holds a (positive button index, negative button index, multiplier,
+# quadratic) tuple per button driven joint, whose velocity is the difference of the two buttons,
+# quadratically scaled if requested
+def shape_arm_inputs(axes, buttons, axis_joints, button_joints, threshold):
+    velocities = [multiplier * deadzone_quadratic(axes[axis], threshold) for axis, multiplier in axis_joints]
+    for pos, neg, multiplier, is_quadratic in button_joints:
+        velocity = buttons[pos] - buttons[neg]
+        if is_quadratic:
+            velocity = quadratic(velocity)
+        velocities.append(multiplier * velocity)
+    return velocities
 
 
 class Drive:
@@ -39,7 +42,12 @@ class Drive:
         # Constants for diff drive
         self.TRACK_RADIUS = track_radius  # meter
         self.WHEEL_RADIUS = wheel_radius  # meter
+        # Precomputed diff drive coefficients
+        self.INV_WHEEL_RADIUS = 1.0 / wheel_radius
+        self.HALF_TRACK_OVER_WHEEL = track_radius / (2.0 * wheel_radius)
         self.drive_vel_pub = ros.Publisher("/drive_cmd_wheels", Chassis, queue_size=100)
+        # Command is reused across callbacks
+        self.command = Chassis()
 
     # TODO: Reimplement Dampen Switch
     def teleop_drive_callback(self, msg):
@@ -50,12 +58,12 @@ class Drive:
         omega = msg.angular.z * 2
 
         # Transform into L & R wheel angular velocities using diff drive kinematics
-        omega_l = (v - omega * self.TRACK_RADIUS / 2.0) / self.WHEEL_RADIUS
-        omega_r = (v + omega * self.TRACK_RADIUS / 2.0) / self.WHEEL_RADIUS
+        wheel_v = v * self.INV_WHEEL_RADIUS
+        wheel_omega = omega * self.HALF_TRACK_OVER_WHEEL
 
-        command = Chassis()
-        command.omega_l = omega_l
-        command.omega_r = omega_r
+        command = self.command
+        command.omega_l = wheel_v - wheel_omega
+        command.omega_r = wheel_v + wheel_omega
 
         self.drive_vel_pub.publish(command)
 
@@ -77,71 +85,44 @@ class ArmControl:
         self.finger_pub = ros.Publisher("/hand/open_loop/finger", JointState, queue_size=100)
         self.grip_pub = ros.Publisher("/hand/open_loop/grip", JointState, queue_size=100)
 
-    def ra_control_callback(self, msg):
-        joints: typing.Dict[str, JointState] = {}
-
-        # Arm Joints
-        create_joint_msg(
-            joints,
-            "joint_a",
-            self.ra_config["joint_a"]["multiplier"]
-            * quadratic(deadzone(msg.axes[self.xbox_mappings["left_js_x"]], 0.15)),
-        )
-        create_joint_msg(
-            joints,
-            "joint_b",
-            self.ra_config["joint_b"]["multiplier"]
-            * quadratic(-deadzone(msg.axes[self.xbox_mappings["left_js_y"]], 0.15)),
-        )
-        create_joint_msg(
-            joints,
-            "joint_c",
-            self.ra_config["joint_c"]["multiplier"]
-            * quadratic(-deadzone(msg.axes[self.xbox_mappings["right_js_y"]], 0.15)),
-        )
-        create_joint_msg(
-            joints,
-            "joint_d",
-            self.ra_config["joint_d"]["multiplier"]
-            * quadratic(deadzone(msg.axes[self.xbox_mappings["right_js_x"]], 0.15)),
+        # Joints a-d are driven by joystick axes as (axis index, multiplier), with joints b and c inverted.
+        # Joints e-grip are driven by (positive button index, negative button index, multiplier, quadratic).
+        # Mapping names are resolved here so the callback never touches the dicts
+        self.arm_axis_joints = (
+            (xbox_mappings["left_js_x"], ra_config["joint_a"]["multiplier"]),
+            (xbox_mappings["left_js_y"], -ra_config["joint_b"]["multiplier"]),
+            (xbox_mappings["right_js_y"], -ra_config["joint_c"]["multiplier"]),
+            (xbox_mappings["right_js_x"], ra_config["joint_d"]["multiplier"]),
         )
-        create_joint_msg(
-            joints,
-            "joint_e",
-            self.ra_config["joint_e"]["multiplier"]
-            * quadratic(
-                msg.buttons[self.xbox_mappings["right_trigger"]] - msg.buttons[self.xbox_mappings["left_trigger"]]
-            ),
-        )
-        create_joint_msg(
-            joints,
-            "joint_f",
-            self.ra_config["joint_f"]["multiplier"]
-            * (msg.buttons[self.xbox_mappings["right_bumper"]] - msg.buttons[self.xbox_mappings["left_bumper"]]),
+        # Only joint e (the triggers) is quadratically scaled
+        self.arm_button_joints = (
+            (xbox_mappings["right_trigger"], xbox_mappings["left_trigger"], ra_config["joint_e"]["multiplier"], True),
+            (xbox_mappings["right_bumper"], xbox_mappings["left_bumper"], ra_config["joint_f"]["multiplier"], False),
+            (xbox_mappings["y"], xbox_mappings["a"], ra_config["finger"]["multiplier"], False),
+            (xbox_mappings["b"], xbox_mappings["x"], ra_config["grip"]["multiplier"], False),
         )
 
-        # Hand Joints
-        create_joint_msg(
-            joints,
-            "hand_finger",
-            self.ra_config["finger"]["multiplier"]
-            * (msg.buttons[self.xbox_mappings["y"]] - msg.buttons[self.xbox_mappings["a"]]),
-        )
-        create_joint_msg(
-            joints,
-            "hand_grip",
-            self.ra_config["grip"]["multiplier"]
-            * (msg.buttons[self.xbox_mappings["b"]] - msg.buttons[self.xbox_mappings["x"]]),
-        )
+        # Publisher and message for each joint, in the same order as the shaped velocities.
+        # Messages are reused across callbacks, only their velocity is updated
+        self.joint_pubs: typing.List[typing.Tuple[ros.Publisher, JointState]] = [
+            (pub, JointState(velocity=[0.0]))
+            for pub in [
+                self.joint_a_pub,
+                self.joint_b_pub,
+                self.joint_c_pub,
+                self.joint_d_pub,
+                self.joint_e_pub,
+                self.joint_f_pub,
+                self.finger_pub,
+                self.grip_pub,
+            ]
+        ]
 
-        self.joint_a_pub.publish(joints["joint_a"])
-        self.joint_b_pub.publish(joints["joint_b"])
-        self.joint_c_pub.publish(joints["joint_c"])
-        self.joint_d_pub.publish(joints["joint_d"])
-        self.joint_e_pub.publish(joints["joint_e"])
-        self.joint_f_pub.publish(joints["joint_f"])
-        self.finger_pub.publish(joints["hand_finger"])
-        self.grip_pub.publish(joints["hand_grip"])
+    def ra_control_callback(self, msg):
+        velocities = shape_arm_inputs(msg.axes, msg.buttons, self.arm_axis_joints, self.arm_button_joints, 0.15)
+        for (pub, joint), velocity in zip(self.joint_pubs, velocities):
+            joint.velocity[0] = velocity
+            pub.publish(joint)
 
 
 def main():
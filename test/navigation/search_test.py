@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+# The navigation nodes import their sibling modules directly (e.g. "from context import Context"),
+# put them first so they are not shadowed by the test files in this directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "navigation"))
+
+from search import RESUME_CENTER_THRESH, SearchState, SearchTrajectory
+from util.SE3 import SE3
+
+
+class FakeContext:
+    """
+    Minimal stand-in for the navigation context with a movable rover and a settable fiducial
+    """
+
+    def __init__(self):
+        self.rover_pos = np.zeros(3)
+        self.fiducial_id = 0
+        self.rover = SimpleNamespace(
+            get_pose=lambda: SE3(position=self.rover_pos.copy()),
+            send_drive_command=lambda cmd_vel: None,
+        )
+        self.course = SimpleNamespace(current_waypoint=lambda: SimpleNamespace(fiducial_id=self.fiducial_id))
+        self.env = SimpleNamespace(current_fid_pos=lambda: None)
+
+
+def run_search(state, context, max_ticks=100):
+    """
+    Evaluates the search state, moving the rover onto its target after every tick,
+    until it leaves the search state
+    """
+    for _ in range(max_ticks):
+        outcome = state.evaluate(None)
+        if outcome != "search":
+            return outcome
+        context.rover_pos = np.array(state.traj.get_cur_pt(), dtype=float)
+    return outcome
+
+
+class TestSearch(unittest.TestCase):
+    def test_spiral_traj(self):
+        traj = SearchTrajectory.spiral_traj(np.array([1.5, -2.0]), 1, 2, 0)
+        expected = np.array([[1.5, -2.0, 0], [1.5, -4.0, 0], [-0.5, -4.0, 0], [-0.5, 0.0, 0], [3.5, 0.0, 0]])
+        for i, point in enumerate(expected):
+            traj.cur_pt = i
+            self.assertTrue(np.allclose(traj.get_cur_pt(), point))
+        self.assertEqual(traj.get_cur_pt().dtype, np.float32)
+
+    def test_traj_read_only(self):
+        traj = SearchTrajectory.spiral_traj(np.zeros(2), 1, 1, 0)
+        with self.assertRaises(ValueError):
+            traj.get_cur_pt()[0] = 1.0
+
+    def test_traj_slots(self):
+        traj = SearchTrajectory.spiral_traj(np.zeros(2), 1, 1, 0)
+        self.assertFalse(hasattr(traj, "__dict__"))
+
+    def test_step(self):
+        traj = SearchTrajectory.spiral_traj(np.zeros(2), 1, 1, 0)
+
+        # not arrived, stay on the same point
+        finished, next_pos = traj.step(False)
+        self.assertFalse(finished)
+        self.assertEqual(traj.cur_pt, 0)
+        self.assertTrue(np.allclose(next_pos, [0, 0, 0]))
+
+        # arrived, move onto the next point
+        finished, next_pos = traj.step(True)
+        self.assertFalse(finished)
+        self.assertEqual(traj.cur_pt, 1)
+        self.assertTrue(np.allclose(next_pos, [0, -1, 0]))
+
+        # arriving at the last point finishes the trajectory
+        for _ in range(3):
+            finished, next_pos = traj.step(True)
+            self.assertFalse(finished)
+        self.assertEqual(traj.step(True), (True, None))
+
+    def test_search_finishes(self):
+        context = FakeContext()
+        context.fiducial_id = 1
+        state = SearchState(context)
+        self.assertEqual(run_search(state, context), "waypoint_traverse")
+
+    def test_resume_cached_traj(self):
+        context = FakeContext()
+        state = SearchState(context)
+
+        context.fiducial_id = 1
+        state.evaluate(None)
+        first_traj = state.traj
+        context.fiducial_id = 2
+        state.evaluate(None)
+
+        # returning to the first fiducial within RESUME_CENTER_THRESH of its spiral's center resumes it
+        context.rover_pos = np.array([RESUME_CENTER_THRESH * 0.9, 0, 0])
+        context.fiducial_id = 1
+        state.evaluate(None)
+        self.assertIs(state.traj, first_traj)
+
+        context.fiducial_id = 2
+        state.evaluate(None)
+
+        # returning to the first fiducial further than RESUME_CENTER_THRESH from its spiral's center generates a new one
+        context.rover_pos = np.array([RESUME_CENTER_THRESH * 2, 0, 0])
+        context.fiducial_id = 1
+        state.evaluate(None)
+        self.assertIsNot(state.traj, first_traj)
+        self.assertIs(state.traj_cache[1], state.traj)
+
+    def test_finished_traj_not_resumed(self):
+        context = FakeContext()
+        state = SearchState(context)
+
+        context.fiducial_id = 1
+        self.assertEqual(run_search(state, context), "waypoint_traverse")
+        context.fiducial_id = 2
+        state.evaluate(None)
+
+        # searching for the first fiducial again starts a new spiral instead of resuming the finished one
+        context.fiducial_id = 1
+        self.assertEqual(state.evaluate(None), "search")
+        self.assertLessEqual(state.traj.cur_pt, 1)
+
+
+if __name__ == "__main__":
+    import rostest
+
+    rostest.rosrun("mrover", "search_test", TestSearch)
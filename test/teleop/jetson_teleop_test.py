@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+import yaml
+from sensor_msgs.msg import Joy
+
+# The teleop node is a standalone script rather than part of a python package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "teleop", "jetson"))
+
+import jetson_teleop
+from jetson_teleop import ArmControl, deadzone_quadratic
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "config", "teleop.yaml")
+
+# Distinct multipliers so a velocity sent to the wrong joint is caught
+RA_CONFIG = {
+    "joint_a": {"multiplier": 1},
+    "joint_b": {"multiplier": 2},
+    "joint_c": {"multiplier": 3},
+    "joint_d": {"multiplier": 4},
+    "joint_e": {"multiplier": 5},
+    "joint_f": {"multiplier": 6},
+    "finger": {"multiplier": 7},
+    "grip": {"multiplier": 8},
+}
+
+
+class TestArmControl(unittest.TestCase):
+    def setUp(self):
+        with open(CONFIG_PATH) as config_file:
+            self.xbox_mappings = yaml.safe_load(config_file)["teleop"]["xbox_mappings"]
+        self.publishers = {}
+        with patch.object(
+            jetson_teleop.ros,
+            "Publisher",
+            side_effect=lambda topic, *args, **kwargs: self.publishers.setdefault(topic, MagicMock()),
+        ):
+            self.arm = ArmControl(self.xbox_mappings, RA_CONFIG)
+
+    def published_velocity(self, topic):
+        return self.publishers[topic].publish.call_args[0][0].velocity[0]
+
+    def test_deadzone_quadratic(self):
+        # the deadzone boundary itself maps to zero on both sides
+        self.assertEqual(deadzone_quadratic(0.15, 0.15), 0)
+        self.assertEqual(deadzone_quadratic(-0.15, 0.15), 0)
+        self.assertEqual(deadzone_quadratic(0.0, 0.15), 0)
+        self.assertGreater(deadzone_quadratic(0.16, 0.15), 0)
+        self.assertLess(deadzone_quadratic(-0.16, 0.15), 0)
+        self.assertAlmostEqual(deadzone_quadratic(1.0, 0.15), 1.0)
+        self.assertAlmostEqual(deadzone_quadratic(-0.575, 0.15), -0.25)
+
+    def test_ra_control_callback(self):
+        axes = [0.0] * 8
+        axes[self.xbox_mappings["left_js_x"]] = 1.0
+        axes[self.xbox_mappings["left_js_y"]] = 0.575
+        axes[self.xbox_mappings["right_js_y"]] = -1.0
+        axes[self.xbox_mappings["right_js_x"]] = 0.15
+        buttons = [0] * 16
+        buttons[self.xbox_mappings["right_trigger"]] = 1
+        buttons[self.xbox_mappings["left_bumper"]] = 1
+        buttons[self.xbox_mappings["y"]] = 1
+        buttons[self.xbox_mappings["a"]] = 1
+        buttons[self.xbox_mappings["x"]] = 1
+
+        self.arm.ra_control_callback(Joy(axes=axes, buttons=buttons))
+
+        self.assertAlmostEqual(self.published_velocity("/ra/open_loop/joint_a"), 1.0)
+        # joints b and c are inverted
+        self.assertAlmostEqual(self.published_velocity("/ra/open_loop/joint_b"), -2 * 0.25)
+        self.assertAlmostEqual(self.published_velocity("/ra/open_loop/joint_c"), 3.0)
+        # exactly on the deadzone boundary
+        self.assertEqual(self.published_velocity("/ra/open_loop/joint_d"), 0)
+        self.assertEqual(self.published_velocity("/ra/open_loop/joint_e"), 5)
+        self.assertEqual(self.published_velocity("/ra/open_loop/joint_f"), -6)
+        self.assertEqual(self.published_velocity("/hand/open_loop/finger"), 0)
+        self.assertEqual(self.published_velocity("/hand/open_loop/grip"), -8)
+
+
+if __name__ == "__main__":
+    import rostest
+
+    rostest.rosrun("mrover", "jetson_teleop_test", TestArmControl)